@@ -7,9 +7,15 @@ import yaml
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
+# Prefer libyaml's C loader when PyYAML is built against it (~10x faster),
+# falling back to the pure-Python SafeLoader with identical semantics.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 class Config:
     """Configuration handler for the skills scraper."""
 
+    __slots__ = ("config_path", "_config")
+
     def __init__(self, config_path: str = "config.yaml"):
         """Initialize configuration from YAML file."""
         self.config_path = Path(config_path)
@@ -21,25 +27,15 @@ class Config:
         if self.config_path.is_absolute() or self.config_path.exists():
             config_file = self.config_path
         else:
-            # Search for config.yaml in current directory and parent directories
-            current_dir = Path.cwd()
-            config_file = None
-
-            # Search up to 3 levels up the directory tree
-            for _ in range(4):
-                candidate = current_dir / "config.yaml"
-                if candidate.exists():
-                    config_file = candidate
-                    break
-                if current_dir.parent == current_dir:
-                    break  # Reached root directory
-                current_dir = current_dir.parent
-
-            if config_file is None:
+            # The repo root is known statically from this module's location,
+            # so check it directly instead of stat()ing every parent of cwd.
+            candidate = Path(__file__).resolve().parent.parent / "config.yaml"
+            if not candidate.exists():
                 raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
+            config_file = candidate
 
         with open(config_file, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=_YAML_LOADER)
 
     @property
     def sources_config(self) -> List[Dict[str, Any]]:
@@ -1,71 +1,324 @@
 #!/usr/bin/env python3
 from __future__ import annotations
-import json, os
+import hashlib, json, os, re, tempfile, threading, time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
+from http.client import HTTPConnection, HTTPSConnection, HTTPException
+from pathlib import Path
 from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+from urllib.parse import urlsplit, urljoin
 
 UA = "awesome-metadata-catalog/1.0"
 
+# On-disk cache for GitHub API responses; repeated runs within the TTL skip
+# the HTTP round-trip entirely. Set CATALOG_CACHE_TTL=0 to disable.
+CACHE_DIR = Path(os.environ.get("CATALOG_CACHE_DIR", ".cache/metadata"))
+try:
+    CACHE_TTL = float(os.environ.get("CATALOG_CACHE_TTL", "3600"))
+except ValueError:
+    CACHE_TTL = 3600.0  # unparseable override; fall back to the default
 
-def _jget(url: str, token: str | None) -> dict:
+_STATUS_LABELS = {"ok": "✅ ok", "truncated": "⚠️ truncated", "missing": "❌ missing", "forbidden": "⛔ forbidden", "error": "❌ error"}
+
+# Vendored/VCS/cache directory segments whose SKILL.md copies should not
+# count; a single compiled scan beats splitting each path into segments.
+_EXCLUDED_DIR_RE = re.compile(r"(?:^|/)(?:\.git|node_modules|\.venv|cam_[^/]*)/")
+
+
+def _in_excluded_dir(path: str) -> bool:
+    return _EXCLUDED_DIR_RE.search(path) is not None
+
+
+def _cache_path(url: str) -> Path:
+    # blake2b is the fastest hashlib digest and 16 bytes keeps the keyspace
+    # wide enough that URL collisions are not a concern.
+    return CACHE_DIR / f"{hashlib.blake2b(url.encode('utf-8'), digest_size=16).hexdigest()}.json"
+
+
+def _cache_lookup(url: str):
+    """Return (fresh_data, stale) for a cached URL.
+
+    fresh_data is the payload when the entry is within the TTL; stale is an
+    (etag, data) pair for an expired entry that can still be revalidated with
+    a conditional request. Either (or both) may be None.
+    """
+    path = _cache_path(url)
+    try:
+        mtime = path.stat().st_mtime
+        with open(path, encoding="utf-8") as f:
+            envelope = json.load(f)
+    except (OSError, ValueError):
+        return None, None
+    if not isinstance(envelope, dict) or "_data" not in envelope:
+        return None, None  # pre-envelope cache entry; refetch
+    data = envelope["_data"]
+    if time.time() - mtime < CACHE_TTL:
+        return data, None
+    etag = envelope.get("_etag")
+    return None, ((etag, data) if etag else None)
+
+
+def _cache_put(url: str, data) -> None:
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Unique temp file inside the cache directory itself: concurrent
+        # workers writing the same key cannot collide, and staying on one
+        # filesystem keeps os.replace atomic.
+        fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=CACHE_DIR)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(json.dumps(data))
+            os.replace(tmp, _cache_path(url))
+        except OSError:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        pass  # caching is best-effort; never fail the run over it
+
+
+# Per-thread keep-alive connections, one per host. urlopen pays a fresh
+# TCP+TLS handshake on every call; reusing http.client connections amortizes
+# that across the thousands of API requests a run makes. (HTTP/2 would need a
+# third-party client; this tree stays stdlib-only.)
+_conn_local = threading.local()
+
+
+def _http_request(url: str, token: str | None, data: bytes | None = None, etag: str | None = None) -> tuple[int, str | None, bytes]:
+    """Issue a pooled GET/POST; returns (status, response etag, body).
+
+    With `etag` the request is conditional and a 304 comes back as
+    (304, etag, b"") instead of a body.
+    """
     headers = {"User-Agent": UA, "Accept": "application/vnd.github+json"}
     if token:
         headers["Authorization"] = f"Bearer {token}"
-    with urlopen(Request(url, headers=headers), timeout=30) as resp:
-        return json.loads(resp.read().decode("utf-8"))
+    if data is not None:
+        headers["Content-Type"] = "application/json"
+    if etag:
+        headers["If-None-Match"] = etag
+    conns = getattr(_conn_local, "conns", None)
+    if conns is None:
+        conns = _conn_local.conns = {}
+    for redirect in range(5):
+        parts = urlsplit(url)
+        target = parts.path + (f"?{parts.query}" if parts.query else "")
+        for attempt in (0, 1):
+            conn = conns.get(parts.netloc)
+            if conn is None:
+                cls = HTTPSConnection if parts.scheme == "https" else HTTPConnection
+                conn = conns[parts.netloc] = cls(parts.netloc, timeout=30)
+            try:
+                conn.request("GET" if data is None else "POST", target, body=data, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+            except (HTTPException, OSError) as e:
+                # A stale keep-alive connection; reconnect once before
+                # surfacing the error the way urlopen would.
+                conn.close()
+                conns.pop(parts.netloc, None)
+                if attempt:
+                    raise e if isinstance(e, OSError) else URLError(e)
+                continue
+            if resp.status == 304:
+                return 304, etag, b""
+            if 300 <= resp.status < 400 and resp.getheader("Location"):
+                url = urljoin(url, resp.getheader("Location"))
+                break
+            if resp.status >= 400:
+                raise HTTPError(url, resp.status, resp.reason, resp.headers, None)
+            return resp.status, resp.getheader("ETag"), body
+    raise URLError(f"too many redirects for {url}")
+
 
+def _jget(url: str, token: str | None) -> dict:
+    stale = None
+    if CACHE_TTL > 0:
+        fresh, stale = _cache_lookup(url)
+        if fresh is not None:
+            return fresh
+    status, resp_etag, body = _http_request(url, token, etag=stale[0] if stale else None)
+    if status == 304:
+        if stale is None:
+            # 304 without If-None-Match is a protocol violation (e.g. a
+            # misbehaving proxy); surface it like any other transport error.
+            raise URLError(f"unexpected 304 for {url}")
+        # Unchanged upstream: renew the entry's TTL and reuse it. 304s do not
+        # count against the GitHub rate limit and carry no body.
+        try:
+            now = time.time()
+            os.utime(_cache_path(url), (now, now))
+        except OSError:
+            pass
+        return stale[1]
+    data = json.loads(body.decode("utf-8"))
+    if CACHE_TTL > 0:
+        _cache_put(url, {"_etag": resp_etag, "_data": data})
+    return data
 
-def fetch_repos_from_sources(sources: list[dict]) -> list[dict]:
+
+def fetch_repos_from_sources(sources: list[dict], max_workers: int = 8) -> list[dict]:
     token = os.environ.get("GITHUB_TOKEN")
     merged: dict[str, dict] = {}
-    for source in sources:
-        data = _jget(source["url"], token)
+    if not sources:
+        return []
+    # Fetch sources concurrently; executor.map preserves source order so
+    # later (lower-priority) sources still override earlier ones in the merge.
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(sources))) as ex:
+        results = list(ex.map(lambda s: _jget(s["url"], token), sources))
+    for data in results:
         items = data.values() if isinstance(data, dict) else data
         for entry in items:
-            owner = entry.get("owner") or entry.get("repoOwner") or ""
-            name = entry.get("name") if entry.get("repoOwner") is None else entry.get("repoName")
+            owner, name = _owner_name(entry)
             if owner and name and entry.get("enabled", True):
+                # Normalize to canonical owner/name once at ingestion so every
+                # later _fields call takes the short-circuit path.
+                entry = {**entry, "owner": owner, "name": name}
+                entry.pop("repoOwner", None)
+                entry.pop("repoName", None)
                 merged[f"{owner}/{name}"] = entry
     return list(merged.values())
 
 
+def _owner_name(entry: dict) -> tuple[str, str | None]:
+    if entry.get("repoOwner") is None:
+        return entry.get("owner") or "", entry.get("name")
+    return entry.get("owner") or entry.get("repoOwner"), entry.get("repoName")
+
+
 def _fields(entry: dict) -> dict:
+    owner, name = _owner_name(entry)
     return {
-        "owner": entry.get("owner") or entry.get("repoOwner") or "",
-        "name": entry.get("name") if entry.get("repoOwner") is None else entry.get("repoName"),
+        "owner": owner,
+        "name": name,
         "branch": entry.get("branch") or entry.get("repoBranch") or "main",
         "path": (entry.get("skillsPath") or entry.get("agentsPath") or entry.get("pluginPath") or entry.get("subPath") or "").strip("/"),
     }
 
 
+# Default branches resolved via the repos API, keyed by owner/name. dict ops
+# are atomic under the GIL, so worker threads share this without a lock.
+_default_branches: dict[str, str | None] = {}
+
+
+def _default_branch(full: str, token: str | None) -> str | None:
+    if full not in _default_branches:
+        try:
+            branch = _jget(f"https://api.github.com/repos/{full}", token).get("default_branch")
+        except (HTTPError, URLError, OSError, TimeoutError):
+            branch = None
+        _default_branches[full] = branch
+    return _default_branches[full]
+
+
+def _prefetch_default_branches(entries: list[dict], token: str | None) -> None:
+    """Resolve default branches for entries without a configured branch.
+
+    One batched GraphQL query per 100 repos replaces a 404 tree fetch plus a
+    per-repo REST lookup for every repo whose default branch is not 'main'.
+    Best-effort: GraphQL requires a token, and on any failure the lazy
+    per-repo lookup in _default_branch still applies.
+    """
+    if not token:
+        return
+    targets = []
+    for e in entries:
+        if e.get("branch") or e.get("repoBranch"):
+            continue
+        f = _fields(e)
+        full = f"{f['owner']}/{f['name']}"
+        if full not in _default_branches:
+            targets.append((f["owner"], f["name"], full))
+    for i in range(0, len(targets), 100):
+        batch = targets[i:i + 100]
+        query = "query{" + "".join(
+            f"r{j}: repository(owner:{json.dumps(o)}, name:{json.dumps(n)}){{defaultBranchRef{{name}}}}"
+            for j, (o, n, _) in enumerate(batch)
+        ) + "}"
+        try:
+            _, _, body = _http_request("https://api.github.com/graphql", token, data=json.dumps({"query": query}).encode("utf-8"))
+            data = json.loads(body.decode("utf-8")).get("data") or {}
+        except (HTTPError, URLError, OSError, TimeoutError, ValueError):
+            return
+        for j, (_, _, full) in enumerate(batch):
+            name = ((data.get(f"r{j}") or {}).get("defaultBranchRef") or {}).get("name")
+            if name:
+                _default_branches[full] = name
+
+
+def _get_tree(full: str, branch: str, path: str, token: str | None) -> tuple[dict, bool]:
+    """Fetch the recursive tree, scoped to the configured path when possible.
+
+    `branch:path` resolves like a git revision, so a configured skills path
+    fetches only that subtree instead of the whole repository listing. Returns
+    (tree, scoped); scoped tells the caller whether entry paths are already
+    relative to `path`. Falls back to the full tree when the subtree
+    expression does not resolve, so branch-level failures still surface.
+    """
+    if path:
+        try:
+            return _jget(f"https://api.github.com/repos/{full}/git/trees/{branch}:{path}?recursive=1", token), True
+        except HTTPError as e:
+            if e.code not in (404, 422):
+                raise
+    return _jget(f"https://api.github.com/repos/{full}/git/trees/{branch}?recursive=1", token), False
+
+
 def _count_skill(entry: dict, token: str | None) -> dict:
     f = _fields(entry)
     full = f"{f['owner']}/{f['name']}"
-    try:
-        tree = _jget(f"https://api.github.com/repos/{full}/git/trees/{f['branch']}?recursive=1", token)
-    except HTTPError as e:
-        status = "missing" if e.code == 404 else "forbidden" if e.code == 403 else "error"
-        return {"full": full, "count": 0, "status": status, "note": f"HTTP {e.code}", "branch": f["branch"], "path": f["path"]}
-    except (URLError, OSError, TimeoutError) as e:
-        return {"full": full, "count": 0, "status": "error", "note": str(e)[:120], "branch": f["branch"], "path": f["path"]}
+    # Build the finished README row in one place; render_readme consumes
+    # these as-is instead of re-deriving fields and merging dicts per entry.
+    row = {"full": full, "owner": f["owner"], "name": f["name"], "count": 0, "status": "", "note": "", "branch": f["branch"], "path": f["path"]}
+    # A prefetched default branch replaces the 'main' guess outright, saving
+    # the 404 round-trip for repos that use something else.
+    if not (entry.get("branch") or entry.get("repoBranch")):
+        row["branch"] = _default_branches.get(full) or row["branch"]
+    for attempt in (0, 1):
+        try:
+            tree, scoped = _get_tree(full, row["branch"], f["path"], token)
+            break
+        except HTTPError as e:
+            # The "main" fallback is only a guess; on 404 resolve the real
+            # default branch once (cached) and retry before giving up.
+            if attempt == 0 and e.code == 404 and not (entry.get("branch") or entry.get("repoBranch")):
+                default = _default_branch(full, token)
+                if default and default != row["branch"]:
+                    row["branch"] = default
+                    continue
+            row["status"] = "missing" if e.code == 404 else "forbidden" if e.code == 403 else "error"
+            row["note"] = f"HTTP {e.code}"
+            return row
+        except (URLError, OSError, TimeoutError) as e:
+            row["status"] = "error"
+            row["note"] = str(e)[:120]
+            return row
     count = 0
-    base = f["path"]
+    # A scoped tree's paths are already relative to the configured path, so
+    # no prefix filtering is needed there.
+    base = "" if scoped else f["path"]
+    # Recursive trees run to hundreds of thousands of entries; test the most
+    # selective condition first and hoist the prefix out of the loop.
+    prefix = base + "/"
     for n in tree.get("tree", []):
-        if n.get("type") != "blob":
-            continue
         p = n["path"]
-        if base and not (p.startswith(base + "/") or p == base):
+        if not (p.endswith("/SKILL.md") or p == "SKILL.md"):
             continue
-        if p.endswith("/SKILL.md") or p == "SKILL.md":
+        if base and not (p.startswith(prefix) or p == base):
+            continue
+        if n.get("type") == "blob" and not _in_excluded_dir(p):
             count += 1
-    trunc = bool(tree.get("truncated", False))
-    return {"full": full, "count": count, "status": "truncated" if trunc else "ok", "note": "tree truncated; count is lower bound" if trunc else "", "branch": f["branch"], "path": f["path"]}
+    row["count"] = count
+    if tree.get("truncated", False):
+        row["status"] = "truncated"
+        row["note"] = "tree truncated; count is lower bound"
+    else:
+        row["status"] = "ok"
+    return row
 
 
 def count_skills(entries: list[dict], max_workers: int = 8) -> dict[str, dict]:
     token = os.environ.get("GITHUB_TOKEN")
+    _prefetch_default_branches(entries, token)
     out = {}
     with ThreadPoolExecutor(max_workers=max_workers) as ex:
         futs = {ex.submit(_count_skill, e, token): e for e in entries}
@@ -76,15 +329,23 @@ def count_skills(entries: list[dict], max_workers: int = 8) -> dict[str, dict]:
 
 
 def render_readme(entries: list[dict], counts: dict[str, dict]) -> str:
-    rows = []
-    for e in entries:
-        f = _fields(e)
-        full = f"{f['owner']}/{f['name']}"
-        rows.append({**f, **counts.get(full, {"count": 0, "status": "error", "note": "missing count"})})
+    # _count_skill already emits finished rows; only entries that somehow
+    # missed counting need the field re-derivation fallback.
+    rows = list(counts.values())
+    if len(rows) != len(entries):
+        for e in entries:
+            f = _fields(e)
+            full = f"{f['owner']}/{f['name']}"
+            if full not in counts:
+                rows.append({"full": full, **f, "count": 0, "status": "error", "note": "missing count"})
     rows.sort(key=lambda r: (r["status"] not in {"ok", "truncated"}, r["owner"].lower(), r["name"].lower()))
-    total = sum(r["count"] for r in rows)
-    ok = sum(1 for r in rows if r["status"] == "ok")
-    trunc = sum(1 for r in rows if r["status"] == "truncated")
+    total = ok = trunc = 0
+    for r in rows:
+        total += r["count"]
+        if r["status"] == "ok":
+            ok += 1
+        elif r["status"] == "truncated":
+            trunc += 1
     bad = len(rows) - ok - trunc
     ts = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
     lines = [
@@ -108,7 +369,7 @@ def render_readme(entries: list[dict], counts: dict[str, dict]) -> str:
         repo = f"[{r['full']}](https://github.com/{r['full']})"
         count = f"≥{r['count']:,}" if r['status'] == 'truncated' else f"{r['count']:,}"
         path = f"`{r['path'] or '.'}`"
-        status = {"ok": "✅ ok", "truncated": "⚠️ truncated", "missing": "❌ missing", "forbidden": "⛔ forbidden", "error": "❌ error"}.get(r['status'], r['status'])
+        status = _STATUS_LABELS.get(r['status'], r['status'])
         note = (r.get("note") or "").replace("|", "\\|")
         lines.append(f"| {repo} | {count} | `{r['branch']}` | {path} | {status} | {note} |")
     lines += ["", "## Contributing", "", "Add or disable source repositories in [awesome-repo-configs](https://github.com/Chat2AnyLLM/awesome-repo-configs). This repository is a metadata-only catalog."]
@@ -8,6 +8,7 @@ from repo links defined in awesome-repo-configs.
 import sys
 import argparse
 import logging
+from itertools import zip_longest
 from pathlib import Path
 
 try:
@@ -25,6 +26,30 @@ def setup_logging(level: str = "INFO") -> None:
         format='%(asctime)s - %(levelname)s - %(message)s'
     )
 
+_LINES_DIFFER = object()  # zip_longest fill value; never equal to a line
+
+def _split_lines(f):
+    """Yield lines of an open text file with str.split('\\n') semantics."""
+    ended_with_newline = True
+    for raw in f:
+        ended_with_newline = raw.endswith('\n')
+        yield raw[:-1] if ended_with_newline else raw
+    if ended_with_newline:
+        yield ''
+
+_TIMESTAMP_PREFIX = '- Last updated:'
+
+def _significant_lines(lines):
+    """Drop the '- Last updated:' timestamp line from a line iterable."""
+    for line in lines:
+        i, n = 0, len(line)
+        # Scan past leading whitespace in place rather than allocating a
+        # stripped copy of every line on both sides of the comparison.
+        while i < n and line[i].isspace():
+            i += 1
+        if not line.startswith(_TIMESTAMP_PREFIX, i):
+            yield line
+
 def generate_readme(repositories: list, counts: dict, output_file: str, args: list = None) -> bool:
     """Generate README from source-repository metadata + GitHub API counts."""
     content = render_readme(repositories, counts)
@@ -32,10 +57,18 @@ def generate_readme(repositories: list, counts: dict, output_file: str, args: li
     output_path = Path(output_file)
     if output_path.exists() and not getattr(args, 'force', False):
         try:
-            existing_content = output_path.read_text(encoding='utf-8')
-            existing_no_ts = '\n'.join([line for line in existing_content.split('\n') if not line.strip().startswith('- Last updated:')])
-            new_no_ts = '\n'.join([line for line in content.split('\n') if not line.strip().startswith('- Last updated:')])
-            if existing_no_ts == new_no_ts:
+            # Stream the existing README line-by-line and stop at the first
+            # differing line instead of materializing both filtered copies.
+            with output_path.open('r', encoding='utf-8') as f:
+                unchanged = all(
+                    a == b
+                    for a, b in zip_longest(
+                        _significant_lines(_split_lines(f)),
+                        _significant_lines(content.split('\n')),
+                        fillvalue=_LINES_DIFFER,
+                    )
+                )
+            if unchanged:
                 logging.getLogger(__name__).info("README content unchanged, skipping update to preserve timestamp")
                 return True
         except Exception as e:
@@ -78,13 +111,18 @@ def cmd_generate_readme(args: list, config: dict, logger) -> int:
         logger.warning("No enabled sources found in configuration")
         return 0
 
-    repositories = fetch_repos_from_sources(sources)
+    repositories = fetch_repos_from_sources(sources, max_workers=config.get_max_workers())
     logger.info("Loaded %d enabled repositories from source configs", len(repositories))
 
     counts = count_skills(repositories, max_workers=config.get_max_workers())
-    total_skills = sum(v.get('count', 0) for v in counts.values())
-    unavailable = sum(1 for v in counts.values() if v.get('status') not in {'ok', 'truncated'})
-    truncated = sum(1 for v in counts.values() if v.get('status') == 'truncated')
+    total_skills = unavailable = truncated = 0
+    for v in counts.values():
+        total_skills += v.get('count', 0)
+        status = v.get('status')
+        if status == 'truncated':
+            truncated += 1
+        elif status != 'ok':
+            unavailable += 1
     logger.info("Counted %d skills across %d repos (%d unavailable, %d truncated)", total_skills, len(repositories), unavailable, truncated)
 
     if hasattr(args, 'dry_run') and args.dry_run: